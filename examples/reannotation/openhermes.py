@@ -11,19 +11,24 @@ logger = logging.getLogger("bespokelabs.curator")
 logger.setLevel(logging.INFO)
 
 
-def convert_row(row: dict) -> dict:
-    """Convert a conversation row from OpenHermes format to instruction/response format.
+def convert_rows(batch: dict) -> dict:
+    """Convert a batch of conversations from OpenHermes format to instruction/response format.
+
+    Operating on batches keeps the per-row Python dispatch overhead out of the
+    map call, which matters on the full ~1M-row dataset.
 
     Args:
-        row: Dictionary containing a conversation from the OpenHermes dataset
+        batch: Dictionary mapping column names to lists of values for a batch of rows
 
     Returns:
-        Dictionary with 'instruction' and 'original_response' fields extracted from the conversation
+        Dictionary with 'instruction' and 'original_response' columns extracted from the conversations
     """
-    conversation = row["conversations"]
-    instruction = next((item["value"] for item in conversation if item["from"] == "human"), None)
-    response = next((item["value"] for item in conversation if item["from"] == "gpt"), None)
-    return {"instruction": instruction, "original_response": response}
+    instructions = []
+    responses = []
+    for conversation in batch["conversations"]:
+        instructions.append(next((item["value"] for item in conversation if item["from"] == "human"), None))
+        responses.append(next((item["value"] for item in conversation if item["from"] == "gpt"), None))
+    return {"instruction": instructions, "original_response": responses}
 
 
 class OpenHermesReannotator(curator.LLM):
@@ -43,7 +48,7 @@ distiller = OpenHermesReannotator(model_name="claude-3-5-sonnet-20241022", batch
 
 dataset = load_dataset("teknium/OpenHermes-2.5", split="train")
 dataset = dataset.take(500)
-dataset = dataset.map(convert_row)
+dataset = dataset.map(convert_rows, batched=True, batch_size=1000)
 dataset = dataset.select_columns(["instruction", "original_response"])
 distilled_dataset = distiller(dataset)
 print(distilled_dataset)
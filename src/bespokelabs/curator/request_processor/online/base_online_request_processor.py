@@ -15,7 +15,12 @@ from collections import deque
 from dataclasses import dataclass, field
 
 import aiofiles
-import httpx
+import aiohttp
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from bespokelabs.curator.llm.prompt_formatter import PromptFormatter
 from bespokelabs.curator.request_processor import _DEFAULT_COST_MAP
@@ -37,6 +42,90 @@ logger.setLevel(logging.INFO)
 
 _MAX_OUTPUT_MVA_WINDOW = 50
 
+# How long idle keepalive connections stay open between file passes
+_KEEPALIVE_EXPIRY = 30.0
+
+# How long resolved DNS entries are reused before re-resolving
+_DNS_CACHE_TTL = 300
+
+# Maximum number of queued response lines coalesced into a single write
+_WRITE_BATCH_MAX = 64
+
+# Pushed onto the write queue to tell the writer loop to flush and exit
+_WRITER_SENTINEL = None
+
+
+# Chunk size for reading request files; large reads keep the number of
+# threadpool round-trips through aiofiles proportional to file size, not
+# line count
+_READ_CHUNK_SIZE = 1 << 20
+
+
+# Refresh the cached wallclock at most this often; request timestamps only
+# need coarse resolution
+_CLOCK_REFRESH_INTERVAL = 0.05
+
+_cached_wall_time = datetime.datetime.now()
+_cached_mono_time = time.monotonic()
+
+
+def _cached_now() -> datetime.datetime:
+    """Return a wallclock timestamp refreshed at most every 50 ms.
+
+    ``datetime.datetime.now()`` allocates a datetime and hits gettimeofday on
+    every call; the hot path instead reads a cached value whose staleness is
+    gated by the monotonic clock.
+    """
+    global _cached_wall_time, _cached_mono_time
+    mono = time.monotonic()
+    if mono - _cached_mono_time >= _CLOCK_REFRESH_INTERVAL:
+        _cached_wall_time = datetime.datetime.now()
+        _cached_mono_time = mono
+    return _cached_wall_time
+
+
+async def _read_jsonl_lines(filepath: str) -> t.AsyncIterator[str]:
+    """Yield lines from a JSONL file using large chunked reads.
+
+    ``async for line in file`` with aiofiles dispatches one threadpool read
+    per line; reading megabyte chunks and splitting in memory amortizes that
+    overhead across thousands of lines.
+
+    Args:
+        filepath: Path to the JSONL file to read
+    """
+    async with aiofiles.open(filepath) as file:
+        remainder = ""
+        while True:
+            chunk = await file.read(_READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            buffer = remainder + chunk
+            lines = buffer.split("\n")
+            remainder = lines.pop()
+            for line in lines:
+                if line:
+                    yield line
+        if remainder:
+            yield remainder
+
+
+def _encode_request_body(api_specific_request: dict) -> bytes:
+    """Serialize an API-specific request dict to JSON bytes once.
+
+    Uses orjson when available, falling back to the stdlib encoder.
+    """
+    if orjson is not None:
+        return orjson.dumps(api_specific_request)
+    return json.dumps(api_specific_request).encode()
+
+
+def _decode_json_line(line: str | bytes) -> dict:
+    """Parse one JSON line or payload with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
 
 @dataclass
 class APIRequest:
@@ -50,6 +139,8 @@ class APIRequest:
         result: List to store results/errors from attempts
         prompt_formatter: Formatter for prompts and responses
         created_at: Timestamp when request was created
+        api_specific_request_stream_bytes: The streaming variant of the request
+            body, encoded lazily on first use and reused across retries
     """
 
     task_id: int
@@ -58,7 +149,8 @@ class APIRequest:
     attempts_left: int
     result: list = field(default_factory=list)
     prompt_formatter: PromptFormatter = field(default=None)
-    created_at: datetime.datetime = field(default_factory=datetime.datetime.now)
+    created_at: datetime.datetime = field(default_factory=_cached_now)
+    api_specific_request_stream_bytes: bytes = field(default=None)
 
 
 class BaseOnlineRequestProcessor(BaseRequestProcessor, ABC):
@@ -90,15 +182,42 @@ class BaseOnlineRequestProcessor(BaseRequestProcessor, ABC):
         self.header_based_max_concurrent_requests = None
 
         self.max_batch = config.max_batch
+        # Frozenset so the per-completion membership test is O(1)
+        self._invalid_finish_reasons = frozenset(config.invalid_finish_reasons or ())
 
         # The rich.Console used for the status tracker, only set for testing
         self._tracker_console = None
         self._output_tokens_window = deque(maxlen=_MAX_OUTPUT_MVA_WINDOW)
-        self._semaphore = None
-        if self.max_concurrent_requests is not None:
-            self._semaphore = asyncio.Semaphore(
-                t.cast(int, self.max_concurrent_requests)
-            )
+        self._output_tokens_sum = 0
+        # Admission control: a counter guarded by a condition variable instead of
+        # an asyncio.Semaphore, so the concurrency ceiling can be retuned after
+        # header-based rate limit discovery without mutating Semaphore internals.
+        self._admit_cv = asyncio.Condition()
+        self._in_flight = 0
+        self._write_q: asyncio.Queue | None = None
+        self._cmax = t.cast(int, self.max_concurrent_requests) if self.max_concurrent_requests is not None else 1
+
+    async def _admit(self) -> None:
+        """Wait until an in-flight slot is available, then claim it."""
+        async with self._admit_cv:
+            await self._admit_cv.wait_for(lambda: self._in_flight < self._cmax)
+            self._in_flight += 1
+
+    async def _release(self) -> None:
+        """Release an in-flight slot and wake one waiter."""
+        async with self._admit_cv:
+            self._in_flight -= 1
+            self._admit_cv.notify(1)
+
+    async def set_cmax(self, n: int) -> None:
+        """Resize the concurrency ceiling and wake all waiters to re-check.
+
+        Args:
+            n: New maximum number of in-flight requests
+        """
+        async with self._admit_cv:
+            self._cmax = n
+            self._admit_cv.notify_all()
 
     @property
     def backend(self) -> str:
@@ -220,23 +339,76 @@ class BaseOnlineRequestProcessor(BaseRequestProcessor, ABC):
         cost = self._cost_processor.cost(completion_response=response)
         return cost
 
+    @property
+    def _effective_max_concurrent(self) -> int:
+        """Effective request concurrency for this processor.
+
+        Prefers explicit max_concurrent_requests, else falls back to max_batch,
+        else defaults.
+        """
+        return (
+            self.max_concurrent_requests
+            or self.max_batch
+            or self.default_max_concurrent_requests
+            or 1
+        )
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create an HTTP session backed by an unbounded connector.
+
+        The admission controller already caps in-flight requests, so the
+        connector is left unbounded; a second cap here would just serialize
+        requests behind the pool at high fan-out.
+        """
+        connector = aiohttp.TCPConnector(
+            limit=0,
+            limit_per_host=0,
+            ttl_dns_cache=_DNS_CACHE_TTL,
+            keepalive_timeout=_KEEPALIVE_EXPIRY,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.config.request_timeout),
+        )
+
+    async def _warm_up_session(self, session: aiohttp.ClientSession) -> None:
+        """Hook for subclasses to pre-open connections before processing begins.
+
+        The default implementation does nothing.
+        """
+
     def requests_to_responses(
         self,
         generic_request_files: list[str],
     ) -> None:
         """Process multiple request files and generate corresponding response files.
 
+        All files share one HTTP client so sequential passes reuse the same
+        TLS connections instead of re-handshaking per file.
+
+        Args:
+            generic_request_files: List of request files to process
+        """
+        run_in_event_loop(self._process_request_files(generic_request_files))
+
+    async def _process_request_files(
+        self,
+        generic_request_files: list[str],
+    ) -> None:
+        """Process request files sequentially over a shared HTTP client.
+
         Args:
             generic_request_files: List of request files to process
         """
-        for request_file in generic_request_files:
-            response_file = request_file.replace("requests_", "responses_")
-            run_in_event_loop(
-                self.process_requests_from_file(
+        async with self._create_session() as session:
+            await self._warm_up_session(session)
+            for request_file in generic_request_files:
+                response_file = request_file.replace("requests_", "responses_")
+                await self.process_requests_from_file(
                     generic_request_filepath=request_file,
                     response_file=response_file,
+                    session=session,
                 )
-            )
 
     async def cool_down_if_rate_limit_error(
         self, status_tracker: OnlineStatusTracker
@@ -264,6 +436,7 @@ class BaseOnlineRequestProcessor(BaseRequestProcessor, ABC):
         self,
         generic_request_filepath: str,
         response_file: str,
+        session: aiohttp.ClientSession | None = None,
     ) -> None:
         """Processes API requests with limited concurrency to avoid overloading the API
         while keeping it busy.
@@ -271,9 +444,16 @@ class BaseOnlineRequestProcessor(BaseRequestProcessor, ABC):
         Args:
             generic_request_filepath: Path to file containing requests
             response_file: Path where the response data will be saved
+            session: Shared async HTTP session; one is created (and closed) here
+                when not provided
         """
+        owns_session = session is None
+        if owns_session:
+            session = self._create_session()
         # Initialize trackers
-        queue_of_requests_to_retry: asyncio.Queue[APIRequest] = asyncio.Queue()
+        # Plain deque: only same-loop coroutines touch it, so asyncio.Queue's
+        # lock and getter futures are pure overhead
+        queue_of_requests_to_retry: deque[APIRequest] = deque()
         status_tracker = OnlineStatusTracker(
             token_limit_strategy=self.token_limit_strategy,
             max_requests_per_minute=self.max_requests_per_minute,
@@ -289,137 +469,115 @@ class BaseOnlineRequestProcessor(BaseRequestProcessor, ABC):
         status_tracker.start_tracker(self._tracker_console)
 
         # Determine effective concurrency
-        # Prefer explicit max_concurrent_requests, else fall back to max_batch, else defaults
-        max_concurrent = (
-            self.max_concurrent_requests
-            or self.max_batch
-            or self.default_max_concurrent_requests
-            or 1
-        )
+        max_concurrent = self._effective_max_concurrent
         logger.info(f"setting max_concurrent to: {max_concurrent}")
-        # Size HTTP connection pool to concurrency and keep connections warm
-        limits = httpx.Limits(
-            max_connections=max_concurrent,
-            max_keepalive_connections=max_concurrent,
-        )
 
-        # Create a semaphore to limit concurrency
-        request_semaphore = asyncio.Semaphore(max_concurrent)
-
-        async with httpx.AsyncClient(
-            limits=limits,
-            http2=True,
-            timeout=httpx.Timeout(self.config.request_timeout),
-        ) as session:
-            async with aiofiles.open(generic_request_filepath) as file:
-                pending_requests = set()  # Initialize as a set instead of a list
-
-                async for line in file:
-                    generic_request = GenericRequest.model_validate_json(line)
-
-                    if generic_request.original_row_idx in completed_request_ids:
-                        continue
-
-                    request = APIRequest(
-                        task_id=status_tracker.num_tasks_started,
-                        generic_request=generic_request,
-                        api_specific_request=self.create_api_specific_request_online(generic_request),
-                        attempts_left=self.config.max_retries,
-                        prompt_formatter=self.prompt_formatter,
-                    )
+        # Bound concurrency through the admission controller
+        await self.set_cmax(max_concurrent)
 
-                    if status_tracker.max_tokens_per_minute is not None:
-                        token_estimate = self.estimate_total_tokens(request.generic_request.messages)
-                    else:
-                        token_estimate = None
-
-                    # Wait for capacity if needed
-                    while not status_tracker.has_capacity(token_estimate):
-                        await asyncio.sleep(0.3)  # Increased sleep time to reduce CPU usage
-
-                    # Wait for rate limits cool down if needed
-                    await self.cool_down_if_rate_limit_error(status_tracker)
-
-                    # Consume capacity before making request
-                    status_tracker.consume_capacity(token_estimate)
-
-                    # Create a task that acquires the semaphore before processing
-                    # and releases it after completion
-                    async def process_with_semaphore(req, blocked_tokens):
-                        async with request_semaphore:
-                            status_tracker.num_tasks_in_progress += 1
-                            try:
-                                await self.handle_single_request_with_retries(
-                                    request=req,
-                                    session=session,
-                                    retry_queue=queue_of_requests_to_retry,
-                                    response_file=response_file,
-                                    status_tracker=status_tracker,
-                                    blocked_capacity=blocked_tokens,
-                                )
-                            finally:
-                                status_tracker.num_tasks_in_progress -= 1
-
-                    task = asyncio.create_task(
-                        process_with_semaphore(request, token_estimate)
-                    )
-                    pending_requests.add(task)  # Use add() instead of append()
-                    status_tracker.num_tasks_started += 1
-
-                    # If we have too many pending tasks, wait for some to complete
-                    # This prevents memory issues with extremely large request files
-                    if len(pending_requests) >= max_concurrent * 3:
-                        done, pending_requests = await asyncio.wait(
-                            pending_requests, 
-                            return_when=asyncio.FIRST_COMPLETED
-                        )
-                        # No need to convert back to list
-
-                # Wait for all pending requests to complete
-                if pending_requests:
-                    await asyncio.gather(*pending_requests)
-
-            # Process retries with the same limited concurrency approach
-            pending_retries = set()
-
-            while not queue_of_requests_to_retry.empty() or pending_retries:
-                # Process new items from the queue if we have capacity
-                while not queue_of_requests_to_retry.empty() and len(pending_retries) < max_concurrent:
-
-                    retry_request = await queue_of_requests_to_retry.get()
-
-                    if status_tracker.max_tokens_per_minute is not None:
-                        token_estimate = self.estimate_total_tokens(retry_request.generic_request.messages)
-                    else:
-                        token_estimate = None
-
-                    attempt_number = self.config.max_retries - retry_request.attempts_left
-                    logger.debug(
-                        f"Retrying request {retry_request.task_id} "
-                        f"(attempt #{attempt_number} of {self.config.max_retries})"
-                        f"Previous errors: {retry_request.result}"
+        # Single long-lived append handle fed through a queue, so completions
+        # enqueue their response line instead of paying an open/write/close
+        # cycle each
+        self._write_q = asyncio.Queue()
+        writer_task = asyncio.create_task(self._writer_loop(response_file))
+        workers: list[asyncio.Task] = []
+        prefetch_task = None
+
+        try:
+            # Bounded work queue with long-lived workers instead of one Task per
+            # request; queue backpressure keeps memory flat on huge request files
+            work_queue: asyncio.Queue = asyncio.Queue(maxsize=max_concurrent * 2)
+            workers = [
+                asyncio.create_task(
+                    self._worker(
+                        work_queue=work_queue,
+                        session=session,
+                        retry_queue=queue_of_requests_to_retry,
+                        response_file=response_file,
+                        status_tracker=status_tracker,
                     )
+                )
+                for _ in range(max_concurrent)
+            ]
+
+            # Parse lines and estimate tokens ahead of admission in a bounded
+            # prefetch window, so tokenization overlaps with in-flight HTTP I/O
+            # instead of blocking the event loop per request
+            prefetch_queue: asyncio.Queue = asyncio.Queue(maxsize=max_concurrent * 2)
+            prefetch_task = asyncio.create_task(
+                self._prefetch_requests(
+                    generic_request_filepath=generic_request_filepath,
+                    completed_request_ids=completed_request_ids,
+                    need_token_estimate=status_tracker.max_tokens_per_minute is not None,
+                    prefetch_queue=prefetch_queue,
+                )
+            )
 
-                    # Wait for capacity if needed
-                    while not status_tracker.has_capacity(token_estimate):
-                        await asyncio.sleep(0.5)
+            while True:
+                item = await prefetch_queue.get()
+                if item is None:
+                    break
+                request, token_estimate = item
 
-                    # Consume capacity before making request
-                    status_tracker.consume_capacity(token_estimate)
+                # Wait for capacity if needed
+                await status_tracker.wait_for_capacity(token_estimate)
 
-                    # Process retry with semaphore
-                    task = asyncio.create_task(
-                        process_with_semaphore(retry_request, token_estimate)
-                    )
-                    pending_retries.add(task)  # Use add() instead of append()
-
-                # Wait for some tasks to complete if we have pending retries
-                if pending_retries:
-                    done, pending_retries = await asyncio.wait(
-                        pending_retries,
-                        return_when=asyncio.FIRST_COMPLETED if not queue_of_requests_to_retry.empty() else asyncio.ALL_COMPLETED,
-                        timeout=0.5 if not queue_of_requests_to_retry.empty() else None
-                    )
+                # Wait for rate limits cool down if needed
+                await self.cool_down_if_rate_limit_error(status_tracker)
+
+                # Consume capacity before making request
+                status_tracker.consume_capacity(token_estimate)
+
+                await work_queue.put((request, token_estimate))
+                status_tracker.num_tasks_started += 1
+
+            await prefetch_task
+
+            # Wait for the workers to drain the main pass
+            await work_queue.join()
+
+            # Feed retries back through the same worker pool; a drained batch can
+            # enqueue further retries, so re-check the queue after each join
+            while queue_of_requests_to_retry:
+                retry_request = queue_of_requests_to_retry.popleft()
+
+                if status_tracker.max_tokens_per_minute is not None:
+                    # Off-loop like the ingest path: tiktoken is CPU-bound and
+                    # would stall dispatch of in-flight requests
+                    token_estimate = await asyncio.to_thread(self.estimate_total_tokens, retry_request.generic_request.messages)
+                else:
+                    token_estimate = None
+
+                attempt_number = self.config.max_retries - retry_request.attempts_left
+                logger.debug(
+                    f"Retrying request {retry_request.task_id} "
+                    f"(attempt #{attempt_number} of {self.config.max_retries})"
+                    f"Previous errors: {retry_request.result}"
+                )
+
+                # Wait for capacity if needed
+                await status_tracker.wait_for_capacity(token_estimate)
+
+                # Consume capacity before making request
+                status_tracker.consume_capacity(token_estimate)
+
+                await work_queue.put((retry_request, token_estimate))
+
+                if not queue_of_requests_to_retry:
+                    await work_queue.join()
+        finally:
+            # Tear down tasks and flush the writer even when the pass fails
+            # partway: responses already completed must still be persisted
+            if prefetch_task is not None:
+                prefetch_task.cancel()
+                await asyncio.gather(prefetch_task, return_exceptions=True)
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self._write_q.put_nowait(_WRITER_SENTINEL)
+            await writer_task
+            if owns_session:
+                await session.close()
 
         status_tracker.stop_tracker()
 
@@ -430,6 +588,119 @@ class BaseOnlineRequestProcessor(BaseRequestProcessor, ABC):
         if status_tracker.num_tasks_failed > 0:
             logger.warning(f"{status_tracker.num_tasks_failed} / {status_tracker.num_tasks_started} requests failed. Errors logged to {response_file}.")
 
+    def _build_request(
+        self,
+        line: str,
+        task_id: int,
+        completed_request_ids: set,
+        need_token_estimate: bool,
+    ) -> "tuple[APIRequest, _TokenCount | None] | None":
+        """Parse one request line and estimate its tokens.
+
+        Runs in a worker thread via ``asyncio.to_thread`` so tiktoken/JSON
+        work does not block the event loop.
+
+        Args:
+            line: JSONL line to parse
+            task_id: Task id to assign to the request
+            completed_request_ids: Row indices already present in the response file
+            need_token_estimate: Whether a token estimate is required
+
+        Returns:
+            Tuple of the built request and its token estimate (or None), or
+            None when the row is already completed
+        """
+        # Request files are written by this package, so skip pydantic
+        # validation and construct straight from the parsed dict
+        generic_request = GenericRequest.model_construct(**_decode_json_line(line))
+        if generic_request.original_row_idx in completed_request_ids:
+            return None
+        api_specific_request = self.create_api_specific_request_online(generic_request)
+        request = APIRequest(
+            task_id=task_id,
+            generic_request=generic_request,
+            api_specific_request=api_specific_request,
+            attempts_left=self.config.max_retries,
+            prompt_formatter=self.prompt_formatter,
+        )
+        if need_token_estimate:
+            token_estimate = self.estimate_total_tokens(generic_request.messages)
+        else:
+            token_estimate = None
+        return request, token_estimate
+
+    async def _prefetch_requests(
+        self,
+        generic_request_filepath: str,
+        completed_request_ids: set,
+        need_token_estimate: bool,
+        prefetch_queue: asyncio.Queue,
+    ) -> None:
+        """Read and prepare requests ahead of admission.
+
+        Pushes (request, token estimate) tuples into the bounded prefetch
+        queue and a ``None`` sentinel when the file is exhausted.
+
+        Args:
+            generic_request_filepath: Path to file containing requests
+            completed_request_ids: Row indices already present in the response file
+            need_token_estimate: Whether token estimates are required
+            prefetch_queue: Queue consumed by the admission loop
+        """
+        task_id = 0
+        try:
+            async for line in _read_jsonl_lines(generic_request_filepath):
+                item = await asyncio.to_thread(
+                    self._build_request,
+                    line,
+                    task_id,
+                    completed_request_ids,
+                    need_token_estimate,
+                )
+                if item is None:
+                    continue
+                task_id += 1
+                await prefetch_queue.put(item)
+        finally:
+            await prefetch_queue.put(None)
+
+    async def _worker(
+        self,
+        work_queue: asyncio.Queue,
+        session: aiohttp.ClientSession,
+        retry_queue: deque,
+        response_file: str,
+        status_tracker: OnlineStatusTracker,
+    ) -> None:
+        """Long-lived consumer that pulls requests off the work queue.
+
+        Each worker handles one request at a time, waiting for an admission
+        slot before processing and releasing it exactly once when done. Workers
+        run until cancelled by ``process_requests_from_file``.
+
+        Args:
+            work_queue: Queue of (request, blocked token estimate) tuples
+            session: Async HTTP session
+            retry_queue: Queue for failed requests
+            response_file: Path where the response data will be saved
+            status_tracker: Tracks request status
+        """
+        while True:
+            request, blocked_capacity = await work_queue.get()
+            await self._admit()
+            try:
+                await self.handle_single_request_with_retries(
+                    request=request,
+                    session=session,
+                    retry_queue=retry_queue,
+                    response_file=response_file,
+                    status_tracker=status_tracker,
+                    blocked_capacity=blocked_capacity,
+                )
+            finally:
+                await self._release()
+                work_queue.task_done()
+
     def _free_capacity(
         self,
         status_tracker: OnlineStatusTracker,
@@ -442,8 +713,8 @@ class BaseOnlineRequestProcessor(BaseRequestProcessor, ABC):
     async def handle_single_request_with_retries(
         self,
         request: APIRequest,
-        session: httpx.AsyncClient,
-        retry_queue: asyncio.Queue,
+        session: aiohttp.ClientSession,
+        retry_queue: deque,
         response_file: str,
         status_tracker: OnlineStatusTracker,
         blocked_capacity: "_TokenCount",
@@ -461,15 +732,16 @@ class BaseOnlineRequestProcessor(BaseRequestProcessor, ABC):
             status_tracker: Tracks request status
             blocked_capacity: Blocked token capacity
         """
+        status_tracker.num_tasks_in_progress += 1
         try:
-            start_time = time.time()
+            start_time = time.monotonic()
             generic_response = await self.call_single_request(
                 request=request,
                 session=session,
                 status_tracker=status_tracker,
             )
 
-            if generic_response.finish_reason in self.config.invalid_finish_reasons:
+            if generic_response.finish_reason in self._invalid_finish_reasons:
                 logger.debug(
                     f"Invalid finish_reason {generic_response.finish_reason}."
                     " Raw response {generic_response.raw_response} "
@@ -499,11 +771,10 @@ class BaseOnlineRequestProcessor(BaseRequestProcessor, ABC):
 
         except Exception as e:
             status_tracker.num_other_errors += 1
+            status_tracker.num_errors_by_type[type(e).__name__] += 1
             request.result.append(e)
 
             if request.attempts_left > 0:
-                if "ReadTimeout" in e.__class__.__name__:
-                    request.attempts_left -= 1
                 request.attempts_left -= 1
                 # Free previously blocked token capacity since the request failed
                 try:
@@ -519,9 +790,9 @@ class BaseOnlineRequestProcessor(BaseRequestProcessor, ABC):
                     f"Encountered '{e.__class__.__name__}: {e}' during attempt "
                     f"{self.config.max_retries - request.attempts_left} of {self.config.max_retries} "
                     f"while processing request {request.task_id} "
-                    f"in {time.time() - start_time} seconds"
+                    f"in {time.monotonic() - start_time} seconds"
                 )
-                retry_queue.put_nowait(request)
+                retry_queue.append(request)
             else:
                 logger.error(
                     f"Request {request.task_id} failed permanently after exhausting all {self.config.max_retries} retry attempts. "
@@ -534,7 +805,7 @@ class BaseOnlineRequestProcessor(BaseRequestProcessor, ABC):
                     raw_response=None,
                     generic_request=request.generic_request,
                     created_at=request.created_at,
-                    finished_at=datetime.datetime.now(),
+                    finished_at=_cached_now(),
                 )
                 await self.append_generic_response(generic_response, response_file)
                 status_tracker.num_tasks_failed += 1
@@ -543,6 +814,8 @@ class BaseOnlineRequestProcessor(BaseRequestProcessor, ABC):
             self._add_output_token_moving_window(
                 generic_response.token_usage.completion_tokens
             )
+        finally:
+            status_tracker.num_tasks_in_progress -= 1
 
         # Save response in the base class
         await self.append_generic_response(generic_response, response_file)
@@ -550,10 +823,15 @@ class BaseOnlineRequestProcessor(BaseRequestProcessor, ABC):
         status_tracker.num_tasks_succeeded += 1
 
     def _add_output_token_moving_window(self, tokens):
+        # Keep a running sum so the moving average is O(1) instead of
+        # re-summing the window on every completion
+        if len(self._output_tokens_window) == _MAX_OUTPUT_MVA_WINDOW:
+            self._output_tokens_sum -= self._output_tokens_window[0]
         self._output_tokens_window.append(tokens)
+        self._output_tokens_sum += tokens
 
     def _output_tokens_moving_average(self):
-        return sum(self._output_tokens_window) / (
+        return self._output_tokens_sum / (
             len(self._output_tokens_window) or _MAX_OUTPUT_MVA_WINDOW
         )
 
@@ -561,7 +839,7 @@ class BaseOnlineRequestProcessor(BaseRequestProcessor, ABC):
     async def call_single_request(
         self,
         request: APIRequest,
-        session: httpx.AsyncClient,
+        session: aiohttp.ClientSession,
         status_tracker: OnlineStatusTracker,
     ) -> GenericResponse:
         """Make a single API request without error handling.
@@ -579,16 +857,43 @@ class BaseOnlineRequestProcessor(BaseRequestProcessor, ABC):
         """
         pass
 
+    async def _writer_loop(self, response_file: str) -> None:
+        """Drain the write queue into the response file with one long-lived handle.
+
+        Coalesces up to ``_WRITE_BATCH_MAX`` queued lines per write so bursty
+        completions amortize the underlying syscalls. Exits when the sentinel
+        is dequeued, flushing whatever is buffered first.
+
+        Args:
+            response_file: Path where the response data will be saved
+        """
+        async with aiofiles.open(response_file, "ab") as f:
+            while True:
+                line = await self._write_q.get()
+                if line is _WRITER_SENTINEL:
+                    return
+                batch = [line]
+                while not self._write_q.empty() and len(batch) < _WRITE_BATCH_MAX:
+                    line = self._write_q.get_nowait()
+                    if line is _WRITER_SENTINEL:
+                        await f.write(b"".join(batch))
+                        await f.flush()
+                        return
+                    batch.append(line)
+                await f.write(b"".join(batch))
+                await f.flush()
+
     async def append_generic_response(
         self, data: GenericResponse, filename: str
     ) -> None:
-        """Append a response to a jsonl file with async file operations.
+        """Enqueue a response line for the background writer.
 
         Args:
             data: Response data to append
             filename: File to append to
         """
-        json_string = json.dumps(data.model_dump(), default=str)
-        async with aiofiles.open(filename, "a") as f:
-            await f.write(json_string + "\n")
-        logger.debug(f"Successfully appended response to {filename}")
+        # model_dump_json serializes in a single pydantic-core pass, skipping
+        # the intermediate dict that json.dumps would walk again
+        json_bytes = data.model_dump_json().encode()
+        self._write_q.put_nowait(json_bytes + b"\n")
+        logger.debug(f"Successfully queued response for {filename}")
@@ -1,4 +1,3 @@
-import datetime
 import logging
 import time
 from collections import defaultdict
@@ -7,11 +6,10 @@ import aiohttp
 import instructor
 import litellm
 from pydantic import BaseModel
-import httpx
 
 from bespokelabs.curator.request_processor.config import OnlineRequestProcessorConfig
 from bespokelabs.curator.request_processor.event_loop import run_in_event_loop
-from bespokelabs.curator.request_processor.online.base_online_request_processor import APIRequest, BaseOnlineRequestProcessor
+from bespokelabs.curator.request_processor.online.base_online_request_processor import APIRequest, BaseOnlineRequestProcessor, _cached_now
 from bespokelabs.curator.status_tracker.online_status_tracker import OnlineStatusTracker, TokenLimitStrategy, _TokenCount
 from bespokelabs.curator.types.generic_request import GenericRequest
 from bespokelabs.curator.types.generic_response import GenericResponse, TokenUsage
@@ -293,7 +291,7 @@ class LiteLLMOnlineRequestProcessor(BaseOnlineRequestProcessor):
     async def call_single_request(
         self,
         request: APIRequest,
-        session: httpx.AsyncClient,
+        session: aiohttp.ClientSession,
         status_tracker: OnlineStatusTracker,
     ) -> GenericResponse:
         """Make a single request through LiteLLM.
@@ -358,7 +356,7 @@ class LiteLLMOnlineRequestProcessor(BaseOnlineRequestProcessor):
             raw_response=completion_obj.model_dump(),
             generic_request=request.generic_request,
             created_at=request.created_at,
-            finished_at=datetime.datetime.now(),
+            finished_at=_cached_now(),
             token_usage=token_usage,
             response_cost=cost,
             finish_reason=finish_reason,
@@ -1,4 +1,6 @@
+import asyncio
 import datetime
+import functools
 import logging
 import os
 import time
@@ -6,13 +8,18 @@ from typing import TypeVar
 
 import aiohttp
 import litellm
-import requests
 import tiktoken
-import httpx
 
 from bespokelabs.curator.cost import cost_processor_factory
 from bespokelabs.curator.request_processor.config import OnlineRequestProcessorConfig
-from bespokelabs.curator.request_processor.online.base_online_request_processor import APIRequest, BaseOnlineRequestProcessor
+from bespokelabs.curator.request_processor.event_loop import run_in_event_loop
+from bespokelabs.curator.request_processor.online.base_online_request_processor import (
+    APIRequest,
+    BaseOnlineRequestProcessor,
+    _cached_now,
+    _decode_json_line,
+    _encode_request_body,
+)
 from bespokelabs.curator.request_processor.openai_request_mixin import OpenAIRequestMixin
 from bespokelabs.curator.status_tracker.online_status_tracker import OnlineStatusTracker, _TokenCount
 from bespokelabs.curator.types.generic_request import GenericRequest
@@ -23,6 +30,55 @@ logger = logger = logging.getLogger(__name__)
 
 _DEFAULT_OPENAI_URL: str = "https://api.openai.com/v1/chat/completions"
 
+# Upper bound on connections pre-opened before the first burst of requests
+_WARM_UP_CONNECTIONS = 100
+
+# Model families whose undated names are the latest version
+_STRUCTURED_OUTPUT_LATEST = frozenset({"gpt-4o-mini", "gpt-4o", "o1"})
+
+# Earliest dated release of each family with structured output support, keyed
+# by dated-name prefix; "gpt-4o-mini-" is listed before its "gpt-4o-" prefix
+# so the longer match wins
+_STRUCTURED_OUTPUT_MIN_DATES = {
+    "gpt-4o-mini-": datetime.date(2024, 7, 18),
+    "gpt-4o-": datetime.date(2024, 8, 6),
+    "o1-": datetime.date(2024, 12, 17),
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _get_encoding(name: str) -> tiktoken.Encoding:
+    """Load a tiktoken encoding once per process.
+
+    Building an encoding loads the multi-megabyte mergeable-ranks table, which
+    costs hundreds of milliseconds; every processor instance shares the result.
+    """
+    return tiktoken.get_encoding(name)
+
+
+@functools.lru_cache(maxsize=256)
+def _supports_structured_output(model_name: str) -> bool:
+    """Decide structured output support from the model name, memoized.
+
+    A set hit handles undated names and a startswith walk over three prefixes
+    handles dated ones; dates are built with ``datetime.date`` directly rather
+    than ``strptime``, which is slow enough to matter on the per-request path.
+    """
+    if model_name in _STRUCTURED_OUTPUT_LATEST:
+        return True
+    for prefix, min_date in _STRUCTURED_OUTPUT_MIN_DATES.items():
+        if model_name.startswith(prefix):
+            try:
+                year, month, day = model_name[len(prefix):].split("-")
+                released = datetime.date(int(year), int(month), int(day))
+            except ValueError:
+                return False
+            return released >= min_date
+    return False
+
+# Upper bound on memoized token lengths, to cap memory on high-cardinality content
+_TOKEN_LEN_CACHE_MAX = 10_000
+
 
 class OpenAIOnlineRequestProcessor(BaseOnlineRequestProcessor, OpenAIRequestMixin):
     """OpenAI-specific implementation of the OnlineRequestProcessor.
@@ -62,7 +118,36 @@ class OpenAIOnlineRequestProcessor(BaseOnlineRequestProcessor, OpenAIRequestMixi
         else:
             self.api_key = self.config.api_key or os.getenv("OPENAI_API_KEY")
             self.header_based_max_requests_per_minute, self.header_based_max_tokens_per_minute = (0, 0)
+        # Ask every endpoint for the final usage chunk; OpenAI-compatible
+        # servers follow the same stream_options semantics, and one that
+        # rejects the parameter is detected on its first 400 and all later
+        # bodies are rebuilt without it
+        self._include_stream_usage = True
+        # Set once an endpoint streams without usage, so the tiktoken
+        # accounting fallback only warns a single time
+        self._warned_missing_usage = False
+        # Auth headers are invariant for the processor's lifetime, so they are
+        # built once here rather than per request
+        if "/deployments" in self.url:  # Azure deployment
+            self._request_header = {"api-key": f"{self.api_key}", "Content-Type": "application/json"}
+        else:
+            self._request_header = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
         self.token_encoding = self.get_token_encoding()
+        # Token length of the NUL delimiter used when concatenating values
+        self._nul_token_len = len(self.token_encoding.encode_ordinary("\x00"))
+        self._tok_len_cache: dict[str, int] = {}
+        # Per-token prices resolved once at construction; the hot path then
+        # computes cost with two multiplies instead of litellm's per-response
+        # model lookup
+        model_costs = litellm.model_cost.get(self.config.model, {})
+        self._cost_per_prompt_token = model_costs.get("input_cost_per_token")
+        self._cost_per_completion_token = model_costs.get("output_cost_per_token")
+        # Output estimate is invariant per model; litellm.get_max_tokens walks
+        # provider maps and is too slow for the per-request path
+        if self.config.model in litellm.model_cost:
+            self._estimated_output_tokens = litellm.get_max_tokens(model=self.config.model) // 4
+        else:
+            self._estimated_output_tokens = 0
 
     @property
     def backend(self):
@@ -81,13 +166,21 @@ class OpenAIOnlineRequestProcessor(BaseOnlineRequestProcessor, OpenAIRequestMixi
         if not self.api_key:
             raise ValueError("Missing OpenAI API Key - Please set OPENAI_API_KEY in your environment vars")
 
-        response = requests.post(
-            self.url,
-            headers={"Authorization": f"Bearer {self.api_key}"},
-            json={"model": self.config.model, "messages": []},
-        )
-        rpm = int(response.headers.get("x-ratelimit-limit-requests", 0))
-        tpm = int(response.headers.get("x-ratelimit-limit-tokens", 0))
+        return run_in_event_loop(self._fetch_header_based_rate_limits())
+
+    async def _fetch_header_based_rate_limits(self) -> tuple[int, int]:
+        """Issue a dummy request and read the rate limits off the headers.
+
+        Only the headers are needed, so the response body is never read.
+        """
+        async with aiohttp.ClientSession() as session:
+            async with session.post(
+                self.url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                json={"model": self.config.model, "messages": []},
+            ) as response:
+                rpm = int(response.headers.get("x-ratelimit-limit-requests", 0))
+                tpm = int(response.headers.get("x-ratelimit-limit-tokens", 0))
 
         return rpm, tpm
 
@@ -98,13 +191,10 @@ class OpenAIOnlineRequestProcessor(BaseOnlineRequestProcessor, OpenAIRequestMixi
             int: Estimated number of output tokens
 
         Note:
-            Default implementation returns a conservative estimate.
+            Returns the conservative estimate precomputed in ``__init__``.
             Override this method for more accurate model-specific estimates.
         """
-        if self.config.model in litellm.model_cost:
-            return litellm.get_max_tokens(model=self.config.model) // 4
-        else:
-            return 0
+        return self._estimated_output_tokens
 
     def estimate_total_tokens(self, messages: list) -> _TokenCount:
         """Estimate total tokens for a request using OpenAI's token counting rules.
@@ -123,19 +213,42 @@ class OpenAIOnlineRequestProcessor(BaseOnlineRequestProcessor, OpenAIRequestMixi
             - 2 tokens for assistant reply priming
         """
         num_tokens = 0
+        # Values whose encoded length is not already memoized; encoded in one
+        # batched FFI call below, which releases the GIL and parallelizes
+        # across tiktoken's thread pool
+        misses = []
         for message in messages:
             num_tokens += 4  # every message follows <im_start>{role/name}\n{content}<im_end>\n
             for key, value in message.items():
-                try:
-                    num_tokens += len(self.token_encoding.encode(str(value), disallowed_special=()))
-                except TypeError:
-                    logger.warning(f"Failed to encode value {value} with tiktoken. Assuming 1 token per 4 chars.")
-                    num_tokens += len(str(value)) // 4
+                text = str(value)
+                cached = self._tok_len_cache.get(text)
+                if cached is not None:
+                    num_tokens += cached
+                else:
+                    misses.append(text)
                 if key == "name":  # if there's a name, the role is omitted
                     num_tokens -= 1  # role is always required and always 1 token
 
+        if misses:
+            if len(self._tok_len_cache) < _TOKEN_LEN_CACHE_MAX:
+                try:
+                    lengths = [len(tokens) for tokens in self.token_encoding.encode_ordinary_batch(misses, num_threads=os.cpu_count())]
+                except TypeError:
+                    logger.warning("Failed to encode values with tiktoken. Assuming 1 token per 4 chars.")
+                    lengths = [len(text) // 4 for text in misses]
+                for text, length in zip(misses, lengths, strict=True):
+                    num_tokens += length
+                    self._tok_len_cache[text] = length
+            else:
+                # The cache is full, so per-value lengths are no longer needed
+                # for write-back; encoding one concatenated string amortizes
+                # tiktoken's regex pretokenization across all values, with the
+                # NUL delimiter's tokens subtracted afterwards
+                joined = "\x00".join(misses)
+                num_tokens += len(self.token_encoding.encode_ordinary(joined)) - self._nul_token_len * (len(misses) - 1)
+
         num_tokens += 2  # every reply is primed with <im_start>assistant
-        output_tokens = self.estimate_output_tokens()
+        output_tokens = self._estimated_output_tokens
         return _TokenCount(input=num_tokens, output=output_tokens)
 
     def check_structured_output_support(self) -> bool:
@@ -148,30 +261,9 @@ class OpenAIOnlineRequestProcessor(BaseOnlineRequestProcessor, OpenAIRequestMixi
             Supports:
             - gpt-4o-mini with date >= 2024-07-18 or latest
             - gpt-4o with date >= 2024-08-06 or latest
+            - o1 with date >= 2024-12-17 or latest
         """
-        model_name = self.config.model.lower()
-
-        # Check gpt-4o-mini support
-        if model_name == "gpt-4o-mini":  # Latest version
-            return True
-        if "gpt-4o-mini-" in model_name:
-            mini_date = datetime.datetime.strptime(model_name.split("gpt-4o-mini-")[1], "%Y-%m-%d")
-            if mini_date >= datetime(2024, 7, 18):
-                return True
-
-        # Check gpt-4o and o1 support
-        if model_name in ["gpt-4o", "o1"]:  # Latest version
-            return True
-        if "gpt-4o-" in model_name:
-            base_date = datetime.datetime.strptime(model_name.split("gpt-4o-")[1], "%Y-%m-%d")
-            if base_date >= datetime.datetime(2024, 8, 6):
-                return True
-        if "o1-" in model_name:
-            base_date = datetime.datetime.strptime(model_name.split("o1-")[1], "%Y-%m-%d")
-            if base_date >= datetime.datetime(2024, 12, 17):  # Support o1 dated versions from 2024-12-17
-                return True
-
-        return False
+        return _supports_structured_output(self.config.model.lower())
 
     def create_api_specific_request_online(self, generic_request: GenericRequest) -> dict:
         """Create an OpenAI-specific request from a generic request.
@@ -180,13 +272,60 @@ class OpenAIOnlineRequestProcessor(BaseOnlineRequestProcessor, OpenAIRequestMixi
         """
         return OpenAIRequestMixin.create_api_specific_request_online(self, generic_request)
 
+    async def _warm_up_session(self, session: aiohttp.ClientSession) -> None:
+        """Pre-open connections so the first burst does not queue behind TLS.
+
+        Each new connection to the API costs a TCP + TLS handshake; ramping
+        the pool from zero starves the first seconds of a run. A fan-out of
+        cheap GETs against the models endpoint opens sockets ahead of time.
+        Best-effort: failures are ignored and real requests reconnect as
+        needed.
+        """
+        if not self.url.endswith(self._DEFAULT_COMPLETION_SUFFIX):
+            # Azure-style deployment URLs have no adjacent models endpoint
+            return
+        models_url = self.url[: -len(self._DEFAULT_COMPLETION_SUFFIX)] + "/models"
+        warm_count = min(_WARM_UP_CONNECTIONS, self._effective_max_concurrent)
+
+        async def _probe():
+            try:
+                async with session.get(models_url, headers=self._request_header) as response:
+                    await response.read()
+            except Exception:
+                pass
+
+        await asyncio.gather(*(_probe() for _ in range(warm_count)))
+
+    def _raise_api_error(self, error: dict, status_tracker: OnlineStatusTracker):
+        """Record an API error in the tracker and raise it.
+
+        Args:
+            error: Error payload from the API response
+            status_tracker: Tracks request status
+        """
+        status_tracker.num_api_errors += 1
+        if "rate limit" in error.get("message", "").lower():
+            status_tracker.time_of_last_rate_limit_error = time.time()
+            status_tracker.num_rate_limit_errors += 1
+            status_tracker.num_api_errors -= 1
+            # because handle_single_request_with_retries will double count otherwise
+            status_tracker.num_other_errors -= 1
+        raise Exception(f"API error: {error}")
+
     async def call_single_request(
         self,
         request: APIRequest,
-        session: httpx.AsyncClient,
+        session: aiohttp.ClientSession,
         status_tracker: OnlineStatusTracker,
     ) -> GenericResponse:
-        """Make a single OpenAI API request.
+        """Make a single OpenAI API request over SSE.
+
+        The completion is streamed and assembled chunk by chunk, so the full
+        response is never buffered server-side or parsed in one pass; token
+        usage comes from the final stream event (``include_usage``), at which
+        point the caller can free blocked capacity immediately. Endpoints that
+        ignore ``stream`` and answer with a plain JSON body (proxies, recorded
+        fixtures) are detected via the Content-Type header and parsed whole.
 
         Args:
             request (APIRequest): The request to process
@@ -196,50 +335,179 @@ class OpenAIOnlineRequestProcessor(BaseOnlineRequestProcessor, OpenAIRequestMixi
         Returns:
             GenericResponse: The response from OpenAI
         """
-        request_header = {"Authorization": f"Bearer {self.api_key}"}
-        if "/deployments" in self.url:  # Azure deployment
-            request_header = {"api-key": f"{self.api_key}"}
-
-        response_obj = await session.post(
+        # The streaming body is encoded once on first use; retries then skip
+        # re-serializing the same payload
+        body = request.api_specific_request_stream_bytes
+        if body is None:
+            stream_request = {**request.api_specific_request, "stream": True}
+            if self._include_stream_usage:
+                stream_request["stream_options"] = {"include_usage": True}
+            body = _encode_request_body(stream_request)
+            request.api_specific_request_stream_bytes = body
+
+        saw_event = False
+        usage = None
+        chunk_meta = {}
+        # Per-choice accumulators keyed by choice index, so n>1 completions,
+        # tool calls, refusals, and logprobs all survive reassembly
+        choice_states: dict[int, dict] = {}
+
+        async with session.post(
             self.url,
-            headers=request_header,
-            json=request.api_specific_request,
-            timeout=self.config.request_timeout,
-        )
-        response = response_obj.json()
-
-        if "error" in response:
-            status_tracker.num_api_errors += 1
-            error = response["error"]
-            if "rate limit" in error.get("message", "").lower():
-                status_tracker.time_of_last_rate_limit_error = time.time()
-                status_tracker.num_rate_limit_errors += 1
-                status_tracker.num_api_errors -= 1
-                # because handle_single_request_with_retries will double count otherwise
-                status_tracker.num_other_errors -= 1
-            raise Exception(f"API error: {error}")
-
-        if response_obj.status_code != 200:
-            raise Exception(f"API request failed with status {response_obj.status_code}: {response}")
-
+            headers=self._request_header,
+            data=body,
+        ) as response_obj:
+            if response_obj.status != 200:
+                raw = await response_obj.read()
+                try:
+                    error_response = _decode_json_line(raw)
+                except ValueError:
+                    error_response = {"error": {"message": raw.decode(errors="replace")}}
+                if "error" in error_response:
+                    if "stream_options" in str(error_response["error"]):
+                        # The endpoint rejects stream_options; drop it from
+                        # this body and all later ones so the retry succeeds
+                        self._include_stream_usage = False
+                        request.api_specific_request_stream_bytes = None
+                    self._raise_api_error(error_response["error"], status_tracker)
+                raise Exception(f"API request failed with status {response_obj.status}: {error_response}")
+
+            if "text/event-stream" not in response_obj.headers.get("Content-Type", ""):
+                # The endpoint ignored `stream` and sent a complete JSON
+                # completion; parse it whole as before the streaming switch
+                response = _decode_json_line(await response_obj.read())
+                if "error" in response:
+                    self._raise_api_error(response["error"], status_tracker)
+                return self._response_from_completion(request, response)
+
+            async for raw_line in response_obj.content:
+                line = raw_line.decode("utf-8").rstrip("\r\n")
+                if not line.startswith("data: "):
+                    continue
+                payload = line[len("data: "):]
+                if payload == "[DONE]":
+                    break
+                chunk = _decode_json_line(payload)
+                saw_event = True
+
+                if "error" in chunk:
+                    self._raise_api_error(chunk["error"], status_tracker)
+
+                if not chunk_meta:
+                    chunk_meta = {key: chunk[key] for key in ("id", "object", "created", "model", "system_fingerprint") if key in chunk}
+
+                for choice in chunk.get("choices") or []:
+                    state = choice_states.setdefault(
+                        choice.get("index", 0),
+                        {"content": [], "refusal": [], "tool_calls": {}, "logprobs": [], "finish_reason": None},
+                    )
+                    delta = choice.get("delta") or {}
+                    if delta.get("content"):
+                        state["content"].append(delta["content"])
+                    if delta.get("refusal"):
+                        state["refusal"].append(delta["refusal"])
+                    for tool_call in delta.get("tool_calls") or []:
+                        slot = state["tool_calls"].setdefault(
+                            tool_call.get("index", 0),
+                            {"id": None, "type": "function", "function": {"name": "", "arguments": ""}},
+                        )
+                        if tool_call.get("id"):
+                            slot["id"] = tool_call["id"]
+                        if tool_call.get("type"):
+                            slot["type"] = tool_call["type"]
+                        function = tool_call.get("function") or {}
+                        if function.get("name"):
+                            slot["function"]["name"] = function["name"]
+                        if function.get("arguments"):
+                            slot["function"]["arguments"] += function["arguments"]
+                    logprobs = choice.get("logprobs")
+                    if logprobs and logprobs.get("content"):
+                        state["logprobs"].extend(logprobs["content"])
+                    if choice.get("finish_reason"):
+                        state["finish_reason"] = choice["finish_reason"]
+                if chunk.get("usage"):
+                    usage = chunk["usage"]
+
+        if not saw_event or not choice_states:
+            # A 200 that produced no completion events must fail the attempt
+            # rather than fabricate an empty successful response
+            raise Exception("API returned an event stream with no completion events")
+        if all(state["finish_reason"] is None for state in choice_states.values()):
+            # The stream was cut off before the completion finished
+            raise Exception("API event stream ended without a finish_reason")
+
+        # Reassemble a completion-shaped response from the accumulated deltas
+        choices = []
+        for index in sorted(choice_states):
+            state = choice_states[index]
+            if state["content"] or not state["tool_calls"]:
+                content = "".join(state["content"])
+            else:
+                content = None  # tool-call-only completions carry no content
+            message = {"role": "assistant", "content": content}
+            if state["refusal"]:
+                message["refusal"] = "".join(state["refusal"])
+            if state["tool_calls"]:
+                message["tool_calls"] = [state["tool_calls"][tool_index] for tool_index in sorted(state["tool_calls"])]
+            choice = {"index": index, "message": message, "finish_reason": state["finish_reason"]}
+            if state["logprobs"]:
+                choice["logprobs"] = {"content": state["logprobs"]}
+            choices.append(choice)
+
+        if usage is None:
+            # The endpoint streamed without a usage chunk; estimate with
+            # tiktoken so cost, token stats, and rate-limit accounting are
+            # not silently zeroed
+            if not self._warned_missing_usage:
+                self._warned_missing_usage = True
+                logger.warning("Endpoint returned no usage in the stream. Falling back to tiktoken estimates for token accounting.")
+            prompt_tokens = self.estimate_total_tokens(request.generic_request.messages).input
+            completion_tokens = 0
+            for choice in choices:
+                message = choice["message"]
+                if message.get("content"):
+                    completion_tokens += len(self.token_encoding.encode_ordinary(message["content"]))
+                if message.get("refusal"):
+                    completion_tokens += len(self.token_encoding.encode_ordinary(message["refusal"]))
+                for tool_call in message.get("tool_calls", ()):
+                    completion_tokens += len(self.token_encoding.encode_ordinary(tool_call["function"]["arguments"]))
+            usage = {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            }
+
+        response = {**chunk_meta, "choices": choices, "usage": usage}
+        return self._response_from_completion(request, response)
+
+    def _response_from_completion(self, request: APIRequest, response: dict) -> GenericResponse:
+        """Build a GenericResponse from a completion-shaped response dict.
+
+        Shared by the streamed path (after reassembly) and the plain-JSON
+        fallback path.
+        """
+        choices0 = response["choices"][0]
+        finish_reason = choices0.get("finish_reason") or "unkown"
         if self.config.return_completions_object:
             response_message = dict(response)
         else:
-            response_message = response["choices"][0]["message"]["content"]
-        finish_reason = response["choices"][0].get("finish_reason", "unkown")
-        usage = response["usage"]
+            response_message = choices0["message"]["content"]
+        usage = response.get("usage") or {}
         token_usage = TokenUsage(
-            prompt_tokens=usage["prompt_tokens"],
-            completion_tokens=usage["completion_tokens"],
-            total_tokens=usage["total_tokens"],
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0),
+            total_tokens=usage.get("total_tokens", 0),
         )
 
-        try:
-            cost = self.completion_cost(response)
-        except Exception as e:
-            cost = 0.0
+        if self._cost_per_prompt_token is not None and self._cost_per_completion_token is not None:
+            cost = token_usage.prompt_tokens * self._cost_per_prompt_token + token_usage.completion_tokens * self._cost_per_completion_token
+        else:
+            # Model not in litellm's static cost table; fall back to the full lookup
+            try:
+                cost = self.completion_cost(response)
+            except Exception:
+                cost = 0.0
 
-        # Create and return response
         return GenericResponse(
             response_message=response_message,
             response_errors=None,
@@ -247,19 +515,13 @@ class OpenAIOnlineRequestProcessor(BaseOnlineRequestProcessor, OpenAIRequestMixi
             raw_response=response,
             generic_request=request.generic_request,
             created_at=request.created_at,
-            finished_at=datetime.datetime.now(),
+            finished_at=_cached_now(),
             token_usage=token_usage,
             response_cost=cost,
             finish_reason=finish_reason,
         )
 
-    def get_token_encoding(self) -> str:
-        """Get the token encoding name for a given model."""
-        if self.config.model.startswith("gpt-4"):
-            name = "cl100k_base"
-        elif self.config.model.startswith("gpt-3.5"):
-            name = "cl100k_base"
-        else:
-            name = "cl100k_base"  # Default to cl100k_base
-
-        return tiktoken.get_encoding(name)
+    def get_token_encoding(self) -> tiktoken.Encoding:
+        """Get the token encoding for the configured model."""
+        # Every supported model family uses cl100k_base
+        return _get_encoding("cl100k_base")
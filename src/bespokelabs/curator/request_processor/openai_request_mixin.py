@@ -1,5 +1,7 @@
+import functools
+import json
 import logging
-from typing import Any
+from typing import Any, Optional
 
 from bespokelabs.curator.types.generic_request import GenericRequest
 
@@ -12,34 +14,55 @@ class OpenAIRequestMixin:
     Provides shared functionality for both batch and online OpenAI request processors.
     """
 
-    def create_api_specific_request_online(self, generic_request: GenericRequest) -> dict:
-        """Create an OpenAI-specific request from a generic request.
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def _build_request_template(model: str, response_format_json: Optional[str], generation_params_json: str) -> dict[str, Any]:
+        """Build the per-request dict once per (model, schema, params) combination.
+
+        Model, response format, and generation params are fixed for an entire
+        run, so the branch-and-assemble work is cached and each request only
+        copies the template and fills in its messages.
 
         Args:
-            generic_request (GenericRequest): Generic request object
+            model: Model name for the request
+            response_format_json: JSON-encoded response format schema, or None
+            generation_params_json: JSON-encoded generation parameters
 
         Returns:
-            dict: OpenAI API-compatible request dictionary
-
-        Note:
-            - Handles JSON schema response format if specified
-            - Applies optional parameters (temperature, top_p, etc.)
+            dict: Template with everything except 'messages' populated
         """
-        request: dict[str, Any] = {
-            "model": generic_request.model,
-            "messages": generic_request.messages,
-        }
+        request: dict[str, Any] = {"model": model}
 
-        if generic_request.response_format:
+        if response_format_json:
             request["response_format"] = {
                 "type": "json_schema",
                 "json_schema": {
                     "name": "output_schema",  # NOTE: not using 'strict': True
-                    "schema": generic_request.response_format,
+                    "schema": json.loads(response_format_json),
                 },
             }
 
-        for key, value in generic_request.generation_params.items():
-            request[key] = value
+        request.update(json.loads(generation_params_json))
+        return request
 
+    def create_api_specific_request_online(self, generic_request: GenericRequest) -> dict:
+        """Create an OpenAI-specific request from a generic request.
+
+        Args:
+            generic_request (GenericRequest): Generic request object
+
+        Returns:
+            dict: OpenAI API-compatible request dictionary
+
+        Note:
+            - Handles JSON schema response format if specified
+            - Applies optional parameters (temperature, top_p, etc.)
+        """
+        template = self._build_request_template(
+            generic_request.model,
+            json.dumps(generic_request.response_format, sort_keys=True) if generic_request.response_format else None,
+            json.dumps(generic_request.generation_params, sort_keys=True),
+        )
+        request = template.copy()
+        request["messages"] = generic_request.messages
         return request
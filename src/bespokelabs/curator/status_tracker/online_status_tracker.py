@@ -1,6 +1,8 @@
+import asyncio
 import logging
 import time
 import typing as t
+from collections import Counter, deque
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Optional
@@ -17,6 +19,13 @@ from bespokelabs.curator.types.generic_response import TokenUsage
 
 logger = logging.getLogger(__name__)
 
+# How often capacity waiters re-check for time-based refills when no explicit
+# notification has arrived
+_CAPACITY_RECHECK_INTERVAL = 0.05
+
+# Length of the sliding window used for request-per-minute accounting
+_RPM_WINDOW_SECONDS = 60.0
+
 
 class TokenLimitStrategy(Enum):
     """Token limit Strategy enum."""
@@ -48,6 +57,8 @@ class OnlineStatusTracker:
     num_tasks_already_completed: int = 0
     num_api_errors: int = 0
     num_other_errors: int = 0
+    # Per-exception-class tallies, keyed by class name, for error observability
+    num_errors_by_type: Counter = field(default_factory=Counter)
     num_rate_limit_errors: int = 0
     available_request_capacity: float = 1.0
     available_token_capacity: float | _TokenCount = 0
@@ -79,6 +90,11 @@ class OnlineStatusTracker:
 
     def __post_init__(self):
         """Post init."""
+        self._capacity_cv = asyncio.Condition()
+        # Monotonic timestamps of requests sent in the last minute; a sliding
+        # window matches the upstream API's own RPM semantics and avoids the
+        # 2x bursting a fixed window allows at its boundary
+        self._request_window: deque = deque()
         if self.token_limit_strategy == TokenLimitStrategy.combined:
             self.available_token_capacity = t.cast(float, self.available_token_capacity)
         else:
@@ -298,10 +314,12 @@ class OnlineStatusTracker:
         current_time = time.time()
         seconds_since_update = current_time - self.last_update_time
         if self.max_requests_per_minute is not None:
-            self.available_request_capacity = min(
-                self.available_request_capacity + self.max_requests_per_minute * seconds_since_update / 60.0,
-                self.max_requests_per_minute,
-            )
+            # Expire request events that have slid out of the window; the
+            # popleft loop is amortized O(1) per consumed request
+            cutoff = time.monotonic() - _RPM_WINDOW_SECONDS
+            while self._request_window and self._request_window[0] <= cutoff:
+                self._request_window.popleft()
+            self.available_request_capacity = self.max_requests_per_minute - len(self._request_window)
 
         if self.token_limit_strategy == TokenLimitStrategy.combined:
             if self.max_tokens_per_minute is not None:
@@ -363,9 +381,38 @@ class OnlineStatusTracker:
         )
         return has_capacity
 
+    async def wait_for_capacity(self, token_estimate: _TokenCount):
+        """Block until there is capacity for a request.
+
+        Capacity refills lazily with elapsed time in ``update_capacity``, so
+        waiters wake on an explicit notification (capacity credited back by
+        ``free_capacity``) or on a short re-check interval for time-based
+        refills, instead of a fixed polling sleep.
+        """
+        async with self._capacity_cv:
+            while not self.has_capacity(token_estimate):
+                try:
+                    await asyncio.wait_for(self._capacity_cv.wait(), timeout=_CAPACITY_RECHECK_INTERVAL)
+                except (asyncio.TimeoutError, TimeoutError):
+                    continue
+
+    def _notify_capacity_waiters(self):
+        """Wake coroutines blocked in ``wait_for_capacity``."""
+
+        async def _notify():
+            async with self._capacity_cv:
+                self._capacity_cv.notify_all()
+
+        try:
+            asyncio.get_running_loop().create_task(_notify())
+        except RuntimeError:
+            # No running loop (sync caller); waiters re-check on the interval
+            pass
+
     def consume_capacity(self, token_estimate: _TokenCount):
         """Consume capacity for a request."""
         if self.max_requests_per_minute is not None:
+            self._request_window.append(time.monotonic())
             self.available_request_capacity -= 1
         if self.token_limit_strategy == TokenLimitStrategy.combined:
             if self.max_tokens_per_minute is not None:
@@ -392,6 +439,7 @@ class OnlineStatusTracker:
         else:
             free = blocked.total - used.total
             self.available_token_capacity += free
+        self._notify_capacity_waiters()
 
     def __del__(self):
         """Ensure progress is stopped on deletion."""
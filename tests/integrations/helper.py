@@ -61,7 +61,8 @@ class SubsubjectLLM(curator.LLM):
         return f"For the given subject {input['subject']}. Generate 3 diverse subsubjects. No explanation."
 
     def parse(self, input: dict, response) -> dict:
-        return [{"subject": input["subject"], "subsubject": subsubject.subject} for subsubject in response.subjects]
+        subject = input["subject"]
+        return [{"subject": subject, "subsubject": subsubject.subject} for subsubject in response.subjects]
 
 
 class QALLM(curator.LLM):
@@ -71,12 +72,16 @@ class QALLM(curator.LLM):
         return f"For the given subsubject {input['subsubject']}. Generate 3 diverse questions and answers. No explanation."
 
     def parse(self, input: dict, response) -> dict:
+        # Bound once here rather than looked up per QA in the comprehension
+        subject = input["subject"]
+        subsubject = input["subsubject"]
         return [
             {
-                "subject": input["subject"],
-                "subsubject": input["subsubject"],
+                "subject": subject,
+                "subsubject": subsubject,
                 "question": qa.question,
-                "answer": qa.answer,
+                # Stripped here so the dataset doesn't need a separate map pass
+                "answer": qa.answer.strip(),
             }
             for qa in response.qas
         ]
@@ -105,7 +110,6 @@ def create_camel(temp_working_dir, batch=False, batch_check_interval=1):
     subject_dataset = subject_prompter()
     subsubject_dataset = subsubject_prompter(subject_dataset)
     qa_dataset = qa_prompter(subsubject_dataset, working_dir=temp_working_dir)
-    qa_dataset = qa_dataset.map(lambda row: {"answer": row["answer"].strip()}, num_proc=2)
     return qa_dataset
 
 
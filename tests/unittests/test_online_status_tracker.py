@@ -78,3 +78,65 @@ def test_online_status_tracker_final_stats():
     assert "1,000" in captured  # Input tokens
     assert "2,000" in captured  # Output tokens
     assert "$0.123" in captured  # Cost
+
+
+def test_request_capacity_sliding_window(monkeypatch):
+    """Test that request capacity tracks a true 60-second sliding window."""
+    from bespokelabs.curator.status_tracker import online_status_tracker as tracker_module
+
+    clock = [1000.0]
+    monkeypatch.setattr(tracker_module.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(tracker_module.time, "time", lambda: clock[0])
+
+    tracker = OnlineStatusTracker(max_requests_per_minute=2, max_tokens_per_minute=10_000)
+    # The dataclass default_factory holds the real time.time, so align it
+    tracker.last_update_time = clock[0]
+    estimate = tracker_module._TokenCount(input=1, output=1)
+
+    # Let the lazy token refill reach its cap so only the request window gates
+    clock[0] += 60.0
+    assert tracker.has_capacity(estimate)
+
+    tracker.consume_capacity(estimate)
+    tracker.consume_capacity(estimate)
+    assert not tracker.has_capacity(estimate)
+
+    # Just shy of a minute later both requests still occupy the window
+    clock[0] += 59.9
+    assert not tracker.has_capacity(estimate)
+
+    # Once they slide out, the full per-minute budget is available again
+    clock[0] += 0.2
+    assert tracker.has_capacity(estimate)
+    assert tracker.available_request_capacity == 2
+
+
+def test_request_capacity_expires_per_request(monkeypatch):
+    """Test that staggered requests free capacity individually, not in bursts."""
+    from bespokelabs.curator.status_tracker import online_status_tracker as tracker_module
+
+    clock = [1000.0]
+    monkeypatch.setattr(tracker_module.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(tracker_module.time, "time", lambda: clock[0])
+
+    tracker = OnlineStatusTracker(max_requests_per_minute=2, max_tokens_per_minute=10_000)
+    # The dataclass default_factory holds the real time.time, so align it
+    tracker.last_update_time = clock[0]
+    estimate = tracker_module._TokenCount(input=1, output=1)
+
+    clock[0] += 60.0
+    tracker.consume_capacity(estimate)
+    clock[0] += 30.0
+    tracker.consume_capacity(estimate)
+    assert not tracker.has_capacity(estimate)
+
+    # 61s after the first request only that one has expired
+    clock[0] += 31.0
+    assert tracker.has_capacity(estimate)
+    assert tracker.available_request_capacity == 1
+
+    # The second slot frees 30s later
+    tracker.consume_capacity(estimate)
+    assert not tracker.has_capacity(estimate)
+    clock[0] += 30.0
+    assert tracker.has_capacity(estimate)
@@ -1,7 +1,16 @@
+from collections import deque
+
 import pytest
 
 from bespokelabs.curator.request_processor.config import OnlineRequestProcessorConfig
-from bespokelabs.curator.request_processor.online.openai_online_request_processor import OpenAIOnlineRequestProcessor
+from bespokelabs.curator.request_processor.online.base_online_request_processor import APIRequest
+from bespokelabs.curator.request_processor.online.openai_online_request_processor import OpenAIOnlineRequestProcessor, _supports_structured_output
+from bespokelabs.curator.status_tracker.online_status_tracker import OnlineStatusTracker
+from bespokelabs.curator.types.generic_request import GenericRequest
+
+
+class FakeReadTimeoutError(Exception):
+    """Class name contains 'ReadTimeout' to cover the removed substring check."""
 
 
 def test_special_token_handling():
@@ -19,3 +28,76 @@ def test_special_token_handling():
         if "<|endoftext|>" in str(e):
             pytest.fail("Special token <|endoftext|> should not raise ValueError")
         raise  # Re-raise if it is a different ValueError
+
+
+@pytest.mark.asyncio
+async def test_failure_costs_exactly_one_attempt(monkeypatch, tmp_path):
+    """Test that each failed attempt decrements the retry budget exactly once."""
+    config = OnlineRequestProcessorConfig(model="gpt-4", max_retries=3)
+    processor = OpenAIOnlineRequestProcessor(config)
+    status_tracker = OnlineStatusTracker()
+    retry_queue = deque()
+    generic_request = GenericRequest(model="gpt-4", messages=[{"role": "user", "content": "hi"}], original_row={}, original_row_idx=0)
+    request = APIRequest(
+        task_id=0,
+        generic_request=generic_request,
+        api_specific_request={},
+        attempts_left=config.max_retries,
+    )
+
+    async def fail_with_timeout(**kwargs):
+        raise FakeReadTimeoutError("simulated timeout")
+
+    monkeypatch.setattr(processor, "call_single_request", fail_with_timeout)
+
+    for failures in range(1, 3):
+        await processor.handle_single_request_with_retries(
+            request=request,
+            session=None,
+            retry_queue=retry_queue,
+            response_file=str(tmp_path / "responses.jsonl"),
+            status_tracker=status_tracker,
+            blocked_capacity=None,
+        )
+        assert request.attempts_left == config.max_retries - failures
+        assert len(retry_queue) == failures
+        assert retry_queue[-1] is request
+
+    assert status_tracker.num_other_errors == 2
+    assert status_tracker.num_errors_by_type["FakeReadTimeoutError"] == 2
+    assert status_tracker.num_tasks_in_progress == 0
+    assert status_tracker.num_tasks_failed == 0
+
+
+@pytest.mark.parametrize(
+    "model_name, expected",
+    [
+        # Undated names are the latest version of each family
+        ("gpt-4o-mini", True),
+        ("gpt-4o", True),
+        ("o1", True),
+        # Dated names on each side of the support boundary
+        ("gpt-4o-mini-2024-07-18", True),
+        ("gpt-4o-2024-08-06", True),
+        ("gpt-4o-2024-05-13", False),
+        ("o1-2024-12-17", True),
+        ("o1-2024-12-16", False),
+        # Names that share a family prefix but are not dated releases
+        ("o1-mini", False),
+        ("gpt-4o-audio-preview", False),
+        ("gpt-4o-2024", False),
+        # Unrelated models
+        ("gpt-3.5-turbo", False),
+        ("gpt-4", False),
+    ],
+)
+def test_supports_structured_output(model_name, expected):
+    """Test structured output support detection across the model-name matrix."""
+    assert _supports_structured_output(model_name) is expected
+
+
+def test_check_structured_output_support_lowercases_model():
+    """Test that the processor-level check is case-insensitive."""
+    config = OnlineRequestProcessorConfig(model="GPT-4o-Mini")
+    processor = OpenAIOnlineRequestProcessor(config)
+    assert processor.check_structured_output_support() is True